@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Import time benchmark
+
+Runs ``python -X importtime`` against the ezcheck modules in a fresh interpreter and reports the cumulative import
+time of each, failing if the parse-only modules pull in the HTTP stack.
+"""
+import subprocess
+import sys
+
+MODULES = ('ezcheck.core', 'ezcheck.cli')
+FORBIDDEN_MODULES = ('requests', 'urllib3')
+RUNS = 5
+
+
+def measure_import(module):
+    """
+    Import a module in a fresh interpreter and collect the -X importtime output.
+
+    :param module: Name of the module to import
+    :return: cumulative import time in microseconds, list of every module imported
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.STDOUT, universal_newlines=True)
+    cumulative = None
+    imported = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        cumulative_us, name = int(fields[1]), fields[2].strip()
+        imported.append(name)
+        if name == module:
+            cumulative = cumulative_us
+    return cumulative, imported
+
+
+def main():
+    failed = False
+    for module in MODULES:
+        timings = []
+        for _ in range(RUNS):
+            cumulative, imported = measure_import(module)
+            timings.append(cumulative)
+        print('%-15s %8.1fms (best of %i)' % (module, min(timings) / 1000.0, RUNS))
+        loaded = sorted(set(FORBIDDEN_MODULES) & set(imported))
+        if loaded:
+            print('%-15s imports the HTTP stack: %s' % (module, ', '.join(loaded)))
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,7 +4,8 @@ import argparse
 import os
 import sys
 import json
-from ezcheck.core import download_ffl_db, parse_file, parse_ffl_number
+from ezcheck.core import download_ffl_db, parse_file, parse_ffl_number, open_ffl_file, compression_from_filename
+from ezcheck.core import COMPRESSION_WRITERS
 from ezcheck.core import logger, CONSOLE_LOG_FORMATTER, DEBUG_LOG_FORMATTER
 
 
@@ -33,6 +34,9 @@ def download_ffl_database():
     """Download FFL List from ATF.gov"""
     parser = argparse.ArgumentParser(parents=[parent_parser, ])
     parser.add_argument('-t', '--testing', action='store_true', dest='testing')
+    parser.add_argument('-c', '--compression', default=None, dest='compression',
+                        choices=sorted(COMPRESSION_WRITERS),
+                        help='compress the download on write (default: detect from filename extension)')
     parser.add_argument('ffl', help='FFL Number')
     parser.add_argument('filename', help='filename to write download')
     args = parser.parse_args()
@@ -43,9 +47,13 @@ def download_ffl_database():
     except ValueError:
         logger.critical('Invalid FFL')
         sys.exit(-1)
-    logger.info("Downloading FFL")
+    compression = args.compression or compression_from_filename(args.filename)
+    if compression:
+        logger.info("Downloading FFL (%s compressed)" % compression)
+    else:
+        logger.info("Downloading FFL")
     file_object = open(args.filename, 'wb+')
-    download_ffl_db(args.ffl, file_object)
+    download_ffl_db(args.ffl, file_object, compression=compression)
     logger.info("Downloaded FFL Database to: %s" % file_object.name)
 
 
@@ -64,7 +72,7 @@ def validate_data():
     if not os.path.isfile(args.filename):
         logger.critical("File doesn't exist: %s" % args.filename)
     logger.info("Opening %s" % args.filename)
-    parsed_data = parse_file(open(args.filename, 'r'))
+    parsed_data = parse_file(open_ffl_file(args.filename))
     logger.info('Finished Load')
     logger.info(json.dumps(parsed_data[0], sort_keys=True, indent=4, separators=(',', ': ')))
     logger.info(json.dumps(parsed_data[-1], sort_keys=True, indent=4, separators=(',', ': ')))
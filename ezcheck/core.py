@@ -2,15 +2,13 @@
 """
 EZCheck Core
 """
-import requests
 import logging
 import os
-from datetime import datetime
-from requests.packages.urllib3.exceptions import InsecureRequestWarning
-import json
+import gzip
+import bz2
+import lzma
 
 
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)  # Ran into issues with the certificate
 logger = logging.getLogger('ezcheck')
 logger.setLevel(logging.INFO)  # Collect all log levels
 CONSOLE_LOG_FORMATTER = logging.Formatter('%(asctime)s: %(message)s')
@@ -55,6 +53,27 @@ ADDRESS_LABELS = (
     'ZipCodePlus',
 )
 BYTE_OFFSETS = (1, 2, 3, 2, 2, 5, 50, 50, 50, 30, 2, 9, 50, 30, 2, 9, 10, 8, 8, 1)
+# Compressed dumps are detected by their magic bytes when reading and by file extension when writing.
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+}
+COMPRESSION_WRITERS = {
+    'gzip': lambda file_object: gzip.GzipFile(fileobj=file_object, mode='wb'),
+    'bz2': lambda file_object: bz2.BZ2File(file_object, mode='wb'),
+    'xz': lambda file_object: lzma.LZMAFile(file_object, mode='wb'),
+}
+COMPRESSION_OPENERS = {
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
 # ffl Number (License Number)	1-15
 # License Name	16-65
 # Business Name	66-115
@@ -126,18 +145,64 @@ def parse_zipcode(zipcode):
     return zipcode, plus
 
 
-def download_ffl_db(ffl_number, file_object):
+def detect_compression(filename):
+    """
+    Determine the compression format of a FFL dump file by looking at its magic bytes.
+
+    :param filename: Path to the file on disk
+    :return: 'gzip', 'bz2', 'xz' or None if the file is not compressed
+    """
+    with open(filename, 'rb') as file_object:
+        header = file_object.read(6)
+    for magic, compression in COMPRESSION_MAGIC:
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def compression_from_filename(filename):
+    """
+    Determine the compression format to write based on the extension of a filename.
+
+    :param filename: Path to the file on disk
+    :return: 'gzip', 'bz2', 'xz' or None if the extension is not a known compression format
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def open_ffl_file(filename):
+    """
+    Open a FFL dump file for reading, transparently decompressing gzip, bz2 and xz files.
+
+    :param filename: Path to the file on disk
+    :return: A readable binary file object suitable for parse_file
+    """
+    compression = detect_compression(filename)
+    if compression is None:
+        return open(filename, 'rb')
+    logger.debug('Detected %s compression for %s' % (compression, filename))
+    return COMPRESSION_OPENERS[compression](filename, 'rb')
+
+
+def download_ffl_db(ffl_number, file_object, compression=None):
     """
     Uses requests to download a copy of the current FFL licensees
 
     :param ffl_number: What the FFL number to download the file is
-    :param filename: which file it should be output to
     :param file_object: A file like object passed to the function will override any filenames that are set
+    :param compression: Optionally compress the download on write, one of 'gzip', 'bz2' or 'xz'
     :return: filename that was written to
     """
     # Check the file object and validate that it is writable:
     if not hasattr(file_object, 'writable') or not file_object.writable():
         raise ValueError('Invalid file_object passed to download_ffl_db')
+    if compression is not None and compression not in COMPRESSION_WRITERS:
+        raise ValueError('Invalid compression passed to download_ffl_db: %s' % compression)
+
+    # requests is only needed for downloading, import it here so parsing never loads the HTTP stack.
+    import requests
+    from requests.packages.urllib3.exceptions import InsecureRequestWarning
+    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)  # Ran into issues with the certificate
     logger.info('Starting download from ATF site using %s' % file_object)
 
     # Setup the post data for download
@@ -166,13 +231,20 @@ def download_ffl_db(ffl_number, file_object):
         file_object.flush()
         raise ValueError("Invalid Response from ATF")
     else:
+        # Wrap the file object if we are compressing on write, closing the wrapper leaves file_object open
+        output = file_object
+        if compression is not None:
+            output = COMPRESSION_WRITERS[compression](file_object)
+
         # Read chunks from the request streaming:
         chunks = 0
         for chunk in response.iter_content(chunk_size=1024):
             chunks += 1
             if not chunks % 1000:
                 logger.debug('%iMB Downloaded' % (chunks/1000))
-            file_object.write(chunk)
+            output.write(chunk)
+        if output is not file_object:
+            output.close()
         file_object.flush()
     return file_object, response
 
@@ -181,24 +253,20 @@ def parse_file(file_object):
     """
     Parse a FFL dump file, given a file descriptor.
 
+    The file is read sequentially and never seeked, so streams such as those returned by open_ffl_file for
+    compressed dumps can be parsed directly.
+
     :param file_object: File descriptor
     :return:
     """
-    if not hasattr(file_object, 'seekable') or not file_object.seekable():
-        raise IOError('fd provided is not seekable')
     if not hasattr(file_object, 'readable') or not file_object.readable():
         raise IOError('fd provided is not readable')
 
-    # Determine the file size
-    file_size = file_object.seek(0, 2)
-
-    # Determine if we need to decode the file as bytes
+    # Read the leading newline, and determine if we need to decode the file as bytes
     decode_bytes = False
     if type(file_object.read(1)) is bytes:
         decode_bytes = True
 
-    # Move pointer to first position in file to skip newline
-    file_object.seek(1, 0)
     results = []
 
     # Loop through each line, using the BYTE_OFFSETS to read each row, discard the newline
@@ -207,6 +275,10 @@ def parse_file(file_object):
         # Disk read operation: ~1.5 seconds/run
         r = list(map(file_object.read, BYTE_OFFSETS))[:19]
 
+        # An empty read means we have reached the end of the stream
+        if not r[0]:
+            break
+
         # If the file is being read as bytes instead of a string, we need to decode before using str
         if decode_bytes:
             r = list(map(bytes.decode, r))
@@ -232,6 +304,4 @@ def parse_file(file_object):
         r.update({'MailingAddress': dict(zip(ADDRESS_LABELS, mailing_address))})
         r.update({'FFLNumber': '-'.join(ffl_id)})
         results.append(r)
-        if file_object.tell() >= file_size:
-            break
     return results